@@ -27,6 +27,7 @@ from dnf.util import logger
 from dnf.i18n import _, P_, ucd
 
 import functools
+import operator
 
 STATE_DEFAULT = libdnf.module.ModulePackageContainer.ModuleState_DEFAULT
 STATE_ENABLED = libdnf.module.ModulePackageContainer.ModuleState_ENABLED
@@ -40,12 +41,18 @@ def _profile_comparison_key(profile):
     return profile.getName()
 
 
+_module_version_key = operator.methodcaller("getVersionNum")
+
+
 class ModuleBase(object):
     # :api
 
     def __init__(self, base):
         # :api
         self.base = base
+        # <module_spec, (modules, nsvcap)> valid for self._modules_cache_container only
+        self._modules_cache = {}
+        self._modules_cache_container = None
 
     def enable(self, module_specs):
         # :api
@@ -72,6 +79,7 @@ class ModuleBase(object):
         no_match_specs, error_specs, solver_errors, module_dicts = \
             self._resolve_specs_enable_update_sack(module_specs)
 
+        mc = self.base._moduleContainer
         # <package_name, set_of_spec>
         fail_safe_repo = hawkey.MODULE_FAIL_SAFE_REPO_NAME
         install_dict = {}
@@ -81,7 +89,7 @@ class ModuleBase(object):
             for name, streamdict in moduledict.items():
                 for stream, module_list in streamdict.items():
                     install_module_list = [x for x in module_list
-                                           if self.base._moduleContainer.isModuleActive(x.getId())]
+                                           if mc.isModuleActive(x.getId())]
                     if not install_module_list:
                         logger.error(_("All matches for argument '{0}' in module '{1}:{2}' are not "
                                        "active").format(spec, name, stream))
@@ -110,8 +118,7 @@ class ModuleBase(object):
                             no_match_specs.append(spec)
                             continue
                     else:
-                        profiles_strings = self.base._moduleContainer.getDefaultProfiles(
-                            name, stream)
+                        profiles_strings = mc.getDefaultProfiles(name, stream)
                         if not profiles_strings:
                             available_profiles = latest_module.getProfiles()
                             if available_profiles:
@@ -134,7 +141,7 @@ class ModuleBase(object):
 
                             profiles.extend(module_profiles)
                     for profile in profiles:
-                        self.base._moduleContainer.install(latest_module ,profile.getName())
+                        mc.install(latest_module, profile.getName())
                         for pkg_name in profile.getContent():
                             install_dict.setdefault(pkg_name, set()).add(spec)
                     for module in install_module_list:
@@ -160,10 +167,11 @@ class ModuleBase(object):
         # collect name of artifacts from active modules for distrosync before sack update
         active_artifacts_names = set()
         src_arches = {"nosrc", "src"}
+        mc = self.base._moduleContainer
         for spec, (nsvcap, moduledict) in module_dicts.items():
             for name in moduledict.keys():
-                for module in self.base._moduleContainer.query(name, "", "", "", ""):
-                    if self.base._moduleContainer.isModuleActive(module):
+                for module in mc.query(name, "", "", "", ""):
+                    if mc.isModuleActive(module):
                         for artifact in module.getArtifacts():
                             arch = artifact.rsplit(".", 1)[1]
                             if arch in src_arches:
@@ -184,13 +192,13 @@ class ModuleBase(object):
         fail_safe_repo_used = False
 
         # list of name: [profiles] for module profiles being removed
-        removed_profiles = self.base._moduleContainer.getRemovedProfiles()
+        removed_profiles = mc.getRemovedProfiles()
 
         for spec, (nsvcap, moduledict) in module_dicts.items():
             for name, streamdict in moduledict.items():
                 for stream, module_list in streamdict.items():
                     install_module_list = [x for x in module_list
-                                           if self.base._moduleContainer.isModuleActive(x.getId())]
+                                           if mc.isModuleActive(x.getId())]
                     if not install_module_list:
                         "No active matches for argument '{0}' in module '{1}:{2}'"
                         logger.error(_("No active matches for argument '{0}' in module "
@@ -230,7 +238,7 @@ class ModuleBase(object):
                                 continue
                             profiles.extend(module_profiles)
                     for profile in profiles:
-                        self.base._moduleContainer.install(latest_module, profile.getName())
+                        mc.install(latest_module, profile.getName())
                         for pkg_name in profile.getContent():
                             install_dict.setdefault(pkg_name, set()).add(spec)
                     for module in install_module_list:
@@ -256,6 +264,7 @@ class ModuleBase(object):
         all_names.update(active_artifacts_names)
         remove_query = self.base.sack.query().filterm(empty=True)
         base_no_source_query = self.base.sack.query().filterm(arch__neq=['src', 'nosrc']).apply()
+        goal = self.base._goal
 
         for pkg_name in all_names:
             query = base_no_source_query.filter(name=pkg_name)
@@ -275,7 +284,7 @@ class ModuleBase(object):
                 query = only_new_module
             sltr = dnf.selector.Selector(self.base.sack)
             sltr.set(pkg=query)
-            self.base._goal.distupgrade(select=sltr)
+            goal.distupgrade(select=sltr)
         self.base._remove_if_unneeded(remove_query)
 
         if no_match_specs or error_specs or solver_errors:
@@ -295,6 +304,7 @@ class ModuleBase(object):
         no_match_specs = []
         fail_safe_repo = hawkey.MODULE_FAIL_SAFE_REPO_NAME
         fail_safe_repo_used = False
+        mc = self.base._moduleContainer
 
         #  Remove source packages because they cannot be installed or upgraded
         base_no_source_query = self.base.sack.query().filterm(arch__neq=['src', 'nosrc']).apply()
@@ -305,7 +315,7 @@ class ModuleBase(object):
                 no_match_specs.append(spec)
                 continue
             update_module_list = [x for x in module_list
-                                  if self.base._moduleContainer.isModuleActive(x.getId())]
+                                  if mc.isModuleActive(x.getId())]
             if not update_module_list:
                 logger.error(_("Unable to resolve argument {}").format(spec))
                 continue
@@ -313,8 +323,8 @@ class ModuleBase(object):
             upgrade_package_set = set()
             for name, streamdict in module_dict.items():
                 for stream, module_list_from_dict in streamdict.items():
-                    upgrade_package_set.update(self._get_package_name_set_and_remove_profiles(
-                        module_list_from_dict, nsvcap))
+                    # content of installed profiles is a subset of what is collected below,
+                    # so there is no need to query it separately
                     latest_module = self._get_latest(module_list_from_dict)
                     if latest_module.getRepoID() == fail_safe_repo:
                         msg = _(
@@ -370,7 +380,7 @@ class ModuleBase(object):
 
         if remove_package_set:
             keep_pkg_names = self.base._moduleContainer.getInstalledPkgNames()
-            remove_package_set = remove_package_set.difference(keep_pkg_names)
+            remove_package_set.difference_update(keep_pkg_names)
             if remove_package_set:
                 query = self.base.sack.query().installed().filterm(name=remove_package_set)
                 if query:
@@ -383,6 +393,19 @@ class ModuleBase(object):
 
     def _get_modules(self, module_spec):
         # used by ansible (lib/ansible/modules/packaging/os/dnf.py)
+        mc = self.base._moduleContainer
+        if self._modules_cache_container is not mc:
+            self._modules_cache = {}
+            self._modules_cache_container = mc
+        try:
+            return self._modules_cache[module_spec]
+        except KeyError:
+            pass
+        result = self._query_modules(module_spec)
+        self._modules_cache[module_spec] = result
+        return result
+
+    def _query_modules(self, module_spec):
         subj = hawkey.Subject(module_spec)
         for nsvcap in subj.nsvcap_possibilities():
             name = nsvcap.name if nsvcap.name else ""
@@ -394,27 +417,24 @@ class ModuleBase(object):
                 version = str(nsvcap.version)
             modules = self.base._moduleContainer.query(name, stream, version, context, arch)
             if modules:
-                return modules, nsvcap
+                return tuple(modules), nsvcap
         return (), None
 
     def _get_latest(self, module_list):
-        latest = None
-        if module_list:
-            latest = module_list[0]
-            for module in module_list[1:]:
-                if module.getVersionNum() > latest.getVersionNum():
-                    latest = module
-        return latest
+        if not module_list:
+            return None
+        return max(module_list, key=_module_version_key)
 
     def _create_module_dict_and_enable(self, module_list, spec, enable=True):
+        mc = self.base._moduleContainer
         moduleDict = {}
         for module in module_list:
             moduleDict.setdefault(
                 module.getName(), {}).setdefault(module.getStream(), []).append(module)
 
         for moduleName, streamDict in moduleDict.items():
-            moduleState = self.base._moduleContainer.getModuleState(moduleName)
             if len(streamDict) > 1:
+                moduleState = mc.getModuleState(moduleName)
                 if moduleState != STATE_DEFAULT and moduleState != STATE_ENABLED \
                         and moduleState != STATE_DISABLED:
                     streams_str = "', '".join(
@@ -426,21 +446,17 @@ class ModuleBase(object):
                         module=moduleName)
                     raise EnableMultipleStreamsException(moduleName, msg)
                 if moduleState == STATE_ENABLED:
-                    stream = self.base._moduleContainer.getEnabledStream(moduleName)
+                    stream = mc.getEnabledStream(moduleName)
                 else:
-                    stream = self.base._moduleContainer.getDefaultStream(moduleName)
+                    stream = mc.getDefaultStream(moduleName)
                 if not stream or stream not in streamDict:
                     raise EnableMultipleStreamsException(moduleName)
-                for key in sorted(streamDict.keys()):
-                    if key == stream:
-                        if enable:
-                            self.base._moduleContainer.enable(moduleName, key)
-                        continue
-                    del streamDict[key]
-            elif enable:
-                for key in streamDict.keys():
-                    self.base._moduleContainer.enable(moduleName, key)
-            assert len(streamDict) == 1
+                # replacing the value of an existing key is safe while iterating
+                moduleDict[moduleName] = {stream: streamDict[stream]}
+            else:
+                stream = next(iter(streamDict))
+            if enable:
+                mc.enable(moduleName, stream)
         return moduleDict
 
     def _resolve_specs_enable(self, module_specs):
@@ -470,15 +486,19 @@ class ModuleBase(object):
                 debugsolver=self.base.conf.debug_solver)
         except hawkey.Exception as e:
             raise dnf.exceptions.Error(ucd(e))
+        finally:
+            # filter_modules() can add fail-safe modules to the container
+            self._modules_cache = {}
         return solver_errors
 
     def _enable_dependencies(self, module_dicts):
+        mc = self.base._moduleContainer
         error_spec = []
         for spec, (nsvcap, moduleDict) in module_dicts.items():
             for streamDict in moduleDict.values():
                 for modules in streamDict.values():
                     try:
-                        self.base._moduleContainer.enableDependencyTree(
+                        mc.enableDependencyTree(
                             libdnf.module.VectorModulePackagePtr(modules))
                     except RuntimeError as e:
                         error_spec.append(spec)
@@ -498,6 +518,7 @@ class ModuleBase(object):
         return no_match_specs, error_spec, solver_errors, module_dicts
 
     def _modules_reset_or_disable(self, module_specs, to_state):
+        mc = self.base._moduleContainer
         no_match_specs = []
         for spec in module_specs:
             module_list, nsvcap = self._get_modules(spec)
@@ -513,18 +534,18 @@ class ModuleBase(object):
                 module_names.add(module.getName())
             for name in module_names:
                 if to_state == STATE_UNKNOWN:
-                    self.base._moduleContainer.reset(name)
+                    mc.reset(name)
                 if to_state == STATE_DISABLED:
-                    self.base._moduleContainer.disable(name)
+                    mc.disable(name)
 
         solver_errors = self._update_sack()
         return no_match_specs, solver_errors
 
     def _get_package_name_set_and_remove_profiles(self, module_list, nsvcap, remove=False):
+        mc = self.base._moduleContainer
         package_name_set = set()
         latest_module = self._get_latest(module_list)
-        installed_profiles_strings = set(self.base._moduleContainer.getInstalledProfiles(
-            latest_module.getName()))
+        installed_profiles_strings = set(mc.getInstalledProfiles(latest_module.getName()))
         if not installed_profiles_strings:
             return set()
         if nsvcap.profile:
@@ -534,18 +555,19 @@ class ModuleBase(object):
             for profile in profiles_set:
                 if profile.getName() in installed_profiles_strings:
                     if remove:
-                        self.base._moduleContainer.uninstall(latest_module, profile.getName())
+                        mc.uninstall(latest_module, profile.getName())
                     package_name_set.update(profile.getContent())
         else:
             for profile_string in installed_profiles_strings:
                 if remove:
-                    self.base._moduleContainer.uninstall(latest_module, profile_string)
+                    mc.uninstall(latest_module, profile_string)
                 for profile in latest_module.getProfiles(profile_string):
                     package_name_set.update(profile.getContent())
         return package_name_set
 
     def _get_info_profiles(self, module_specs):
         output = set()
+        seen_ids = set()
         for module_spec in module_specs:
             module_list, nsvcap = self._get_modules(module_spec)
             if not module_list:
@@ -556,6 +578,10 @@ class ModuleBase(object):
                 logger.info(_("Ignoring unnecessary profile: '{}/{}'").format(
                     nsvcap.name, nsvcap.profile))
             for module in module_list:
+                module_id = module.getId()
+                if module_id in seen_ids:
+                    continue
+                seen_ids.add(module_id)
 
                 lines = OrderedDict()
                 lines["Name"] = module.getFullIdentifier()
@@ -567,44 +593,57 @@ class ModuleBase(object):
                 output.add(self._create_simple_table(lines).toString())
         return "\n\n".join(sorted(output))
 
-    def _profile_report_formatter(self, modulePackage, default_profiles, enabled_str):
-        installed_profiles = self.base._moduleContainer.getInstalledProfiles(
-            modulePackage.getName())
-        available_profiles = modulePackage.getProfiles()
-        profiles_str = ""
-        for profile in sorted(available_profiles, key=_profile_comparison_key):
-            profiles_str += "{}{}".format(
-                profile.getName(), " [d]" if profile.getName() in default_profiles else "")
-            profiles_str += " [i], " if profile.getName() in installed_profiles and enabled_str \
-                else ", "
-        return profiles_str[:-2]
+    def _profile_report_formatter(self, modulePackage, default_profiles, installed_profiles,
+                                  enabled_str):
+        default_profiles = set(default_profiles)
+        # installed profiles are marked only for enabled streams
+        marked_installed = installed_profiles if enabled_str else ()
+        profiles = []
+        for profile_name in sorted(profile.getName() for profile in modulePackage.getProfiles()):
+            default = " [d]" if profile_name in default_profiles else ""
+            installed = " [i]" if profile_name in marked_installed else ""
+            profiles.append(f"{profile_name}{default}{installed}")
+        return ", ".join(profiles)
 
     def _summary_report_formatter(self, summary):
         return summary.strip().replace("\n", " ")
 
-    def _module_strs_formatter(self, modulePackage, markActive=False):
+    def _module_strs_formatter(self, modulePackage, is_default_stream, markActive=False):
+        mc = self.base._moduleContainer
         default_str = ""
         enabled_str = ""
         disabled_str = ""
-        if modulePackage.getStream() == self.base._moduleContainer.getDefaultStream(
-                modulePackage.getName()):
+        if is_default_stream:
             default_str = " [d]"
-        if self.base._moduleContainer.isEnabled(modulePackage):
+        if mc.isEnabled(modulePackage):
             if not default_str:
                 enabled_str = " "
             enabled_str += "[e]"
-        elif self.base._moduleContainer.isDisabled(modulePackage):
+        elif mc.isDisabled(modulePackage):
             if not default_str:
                 disabled_str = " "
             disabled_str += "[x]"
-        if markActive and self.base._moduleContainer.isModuleActive(modulePackage):
+        if markActive and mc.isModuleActive(modulePackage):
             if not default_str:
                 disabled_str = " "
             disabled_str += "[a]"
         return default_str, enabled_str, disabled_str
 
+    def _get_report_data(self, rows):
+        # rows: [(modulePackage, name, stream)]
+        # returns <name, default_stream>, <name, set_of_installed_profiles> and
+        # <(name, stream), default_profiles> so that every name is queried only once
+        mc = self.base._moduleContainer
+        names = {row[1] for row in rows}
+        default_streams = {name: mc.getDefaultStream(name) for name in names}
+        installed_profiles = {name: set(mc.getInstalledProfiles(name)) for name in names}
+        default_profiles = {(name, stream): mc.getDefaultProfiles(name, stream)
+                            for __, name, stream in rows}
+        return default_streams, installed_profiles, default_profiles
+
     def _get_info(self, module_specs):
-        output = set()
+        rows = []
+        seen_ids = set()
         for module_spec in module_specs:
             module_list, nsvcap = self._get_modules(module_spec)
             if not module_list:
@@ -615,37 +654,45 @@ class ModuleBase(object):
                 logger.info(_("Ignoring unnecessary profile: '{}/{}'").format(
                     nsvcap.name, nsvcap.profile))
             for modulePackage in module_list:
-                default_str, enabled_str, disabled_str = self._module_strs_formatter(
-                    modulePackage, markActive=True)
-                default_profiles = self.base._moduleContainer.getDefaultProfiles(
-                    modulePackage.getName(), modulePackage.getStream())
-
-                profiles_str = self._profile_report_formatter(
-                    modulePackage, default_profiles, enabled_str)
-
-                lines = OrderedDict()
-                lines["Name"] = modulePackage.getName()
-                lines["Stream"] = modulePackage.getStream() + default_str + enabled_str + \
-                                  disabled_str
-                lines["Version"] = modulePackage.getVersion()
-                lines["Context"] = modulePackage.getContext()
-                lines["Architecture"] = modulePackage.getArch()
-                lines["Profiles"] = profiles_str
-                lines["Default profiles"] = " ".join(default_profiles)
-                lines["Repo"] = modulePackage.getRepoID()
-                lines["Summary"] = modulePackage.getSummary()
-                lines["Description"] = modulePackage.getDescription()
-                req_set = set()
-                for req in modulePackage.getModuleDependencies():
-                    for require_dict in req.getRequires():
-                        for mod_require, stream in require_dict.items():
-                            req_set.add("{}:[{}]".format(mod_require, ",".join(stream)))
-                lines["Requires"] = "\n".join(sorted(req_set))
-                demodularized = modulePackage.getDemodularizedRpms()
-                if demodularized:
-                    lines["Demodularized rpms"] = "\n".join(demodularized)
-                lines["Artifacts"] = "\n".join(sorted(modulePackage.getArtifacts()))
-                output.add(self._create_simple_table(lines).toString())
+                module_id = modulePackage.getId()
+                if module_id in seen_ids:
+                    continue
+                seen_ids.add(module_id)
+                rows.append((modulePackage, modulePackage.getName(), modulePackage.getStream()))
+
+        default_streams, installed_profiles, default_profiles_dict = self._get_report_data(rows)
+        # the rendered info contains the repository, so every module renders a unique string
+        output = []
+        for modulePackage, name, stream in rows:
+            default_str, enabled_str, disabled_str = self._module_strs_formatter(
+                modulePackage, stream == default_streams[name], markActive=True)
+            default_profiles = default_profiles_dict[(name, stream)]
+
+            profiles_str = self._profile_report_formatter(
+                modulePackage, default_profiles, installed_profiles[name], enabled_str)
+
+            lines = OrderedDict()
+            lines["Name"] = name
+            lines["Stream"] = stream + default_str + enabled_str + disabled_str
+            lines["Version"] = modulePackage.getVersion()
+            lines["Context"] = modulePackage.getContext()
+            lines["Architecture"] = modulePackage.getArch()
+            lines["Profiles"] = profiles_str
+            lines["Default profiles"] = " ".join(default_profiles)
+            lines["Repo"] = modulePackage.getRepoID()
+            lines["Summary"] = modulePackage.getSummary()
+            lines["Description"] = modulePackage.getDescription()
+            req_set = set()
+            for req in modulePackage.getModuleDependencies():
+                for require_dict in req.getRequires():
+                    for mod_require, req_streams in require_dict.items():
+                        req_set.add(f"{mod_require}:[{','.join(req_streams)}]")
+            lines["Requires"] = "\n".join(sorted(req_set))
+            demodularized = modulePackage.getDemodularizedRpms()
+            if demodularized:
+                lines["Demodularized rpms"] = "\n".join(demodularized)
+            lines["Artifacts"] = "\n".join(sorted(modulePackage.getArtifacts()))
+            output.append(self._create_simple_table(lines).toString())
         str_table = "\n\n".join(sorted(output))
         if str_table:
             str_table += MODULE_INFO_TABLE_HINT
@@ -674,6 +721,7 @@ class ModuleBase(object):
 
     def _get_full_info(self, module_specs):
         output = set()
+        seen_ids = set()
         for module_spec in module_specs:
             module_list, nsvcap = self._get_modules(module_spec)
             if not module_list:
@@ -684,6 +732,10 @@ class ModuleBase(object):
                 logger.info(_("Ignoring unnecessary profile: '{}/{}'").format(
                     nsvcap.name, nsvcap.profile))
             for modulePackage in module_list:
+                module_id = modulePackage.getId()
+                if module_id in seen_ids:
+                    continue
+                seen_ids.add(module_id)
                 info = modulePackage.getYaml()
                 if info:
                     output.add(info)
@@ -692,7 +744,6 @@ class ModuleBase(object):
 
     def _what_provides(self, rpm_specs):
         output = set()
-        modulePackages = self.base._moduleContainer.getModulePackages()
         baseQuery = self.base.sack.query().filterm(empty=True).apply()
         getBestInitQuery = self.base.sack.query(flags=hawkey.IGNORE_MODULAR_EXCLUDES)
 
@@ -703,34 +754,70 @@ class ModuleBase(object):
                 query=getBestInitQuery))
 
         baseQuery.apply()
+        if not baseQuery:
+            return ""
 
-        for modulePackage in modulePackages:
-            artifacts = modulePackage.getArtifacts()
-            if not artifacts:
-                continue
-            query = baseQuery.filter(nevra_strict=artifacts)
-            if query:
-                for pkg in query:
-                    string_output = ""
-                    profiles = []
-                    for profile in sorted(modulePackage.getProfiles(), key=_profile_comparison_key):
-                        if pkg.name in profile.getContent():
-                            profiles.append(profile.getName())
-                    lines = OrderedDict()
-                    lines["Module"] = modulePackage.getFullIdentifier()
-                    lines["Profiles"] = " ".join(sorted(profiles))
-                    lines["Repo"] = modulePackage.getRepoID()
-                    lines["Summary"] = modulePackage.getSummary()
+        # <artifact, [modulePackage]> for artifacts written as name-epoch:version-release.arch
+        artifact_to_modules = {}
+        # <artifact, [modulePackage]> for artifacts without an explicit epoch
+        other_artifact_to_modules = {}
+        for modulePackage in self.base._moduleContainer.getModulePackages():
+            for artifact in modulePackage.getArtifacts():
+                target = artifact_to_modules if ":" in artifact else other_artifact_to_modules
+                target.setdefault(artifact, []).append(modulePackage)
+        if not artifact_to_modules and not other_artifact_to_modules:
+            return ""
+        # <(name, epoch, version, release, arch), [modulePackage]>, parsed on the first hit
+        parsed_artifact_to_modules = None
+
+        # <module_id, <package_name, set_of_profile_names>>
+        module_profiles = {}
+        query = baseQuery.filter(
+            nevra_strict=list(artifact_to_modules) + list(other_artifact_to_modules))
+        for pkg in query:
+            modules = artifact_to_modules.get(
+                f"{pkg.name}-{pkg.epoch}:{pkg.version}-{pkg.release}.{pkg.arch}", [])
+            if other_artifact_to_modules:
+                if parsed_artifact_to_modules is None:
+                    parsed_artifact_to_modules = self._parse_artifacts(other_artifact_to_modules)
+                modules = modules + parsed_artifact_to_modules.get(
+                    (pkg.name, pkg.epoch, pkg.version, pkg.release, pkg.arch), [])
+            for modulePackage in modules:
+                module_id = modulePackage.getId()
+                profiles_by_pkg_name = module_profiles.get(module_id)
+                if profiles_by_pkg_name is None:
+                    profiles_by_pkg_name = module_profiles[module_id] = {}
+                    for profile in modulePackage.getProfiles():
+                        for pkg_name in profile.getContent():
+                            profiles_by_pkg_name.setdefault(pkg_name, set()).add(
+                                profile.getName())
+                lines = OrderedDict()
+                lines["Module"] = modulePackage.getFullIdentifier()
+                lines["Profiles"] = " ".join(sorted(profiles_by_pkg_name.get(pkg.name, ())))
+                lines["Repo"] = modulePackage.getRepoID()
+                lines["Summary"] = modulePackage.getSummary()
 
-                    table = self._create_simple_table(lines)
+                table = self._create_simple_table(lines)
 
-                    string_output += "{}\n".format(self.base.output.term.bold(str(pkg)))
-                    string_output += "{}".format(table.toString())
-                    output.add(string_output)
+                output.add(f"{self.base.output.term.bold(str(pkg))}\n{table.toString()}")
 
         return "\n\n".join(sorted(output))
 
+    @staticmethod
+    def _parse_artifacts(artifact_to_modules):
+        parsed = {}
+        for artifact, modules in artifact_to_modules.items():
+            try:
+                nevra = hawkey.split_nevra(artifact)
+            except hawkey.ValueException:
+                continue
+            parsed.setdefault(
+                (nevra.name, nevra.epoch, nevra.version, nevra.release, nevra.arch),
+                []).extend(modules)
+        return parsed
+
     def _create_and_fill_table(self, latest):
+        mc = self.base._moduleContainer
         table = libdnf.smartcols.Table()
         table.setTermforce(libdnf.smartcols.Table.TermForce_AUTO)
         table.enableMaxout(True)
@@ -744,31 +831,34 @@ class ModuleBase(object):
         if not self.base.conf.verbose:
             column_info.hidden = True
 
+        rows = []
         for latest_per_repo in latest:
             for nameStreamArch in latest_per_repo:
                 if len(nameStreamArch) == 1:
                     modulePackage = nameStreamArch[0]
                 else:
                     active = [module for module in nameStreamArch
-                              if self.base._moduleContainer.isModuleActive(module)]
+                              if mc.isModuleActive(module)]
                     if active:
                         modulePackage = active[0]
                     else:
                         modulePackage = nameStreamArch[0]
-                line = table.newLine()
-                default_str, enabled_str, disabled_str = self._module_strs_formatter(
-                    modulePackage, markActive=False)
-                default_profiles = self.base._moduleContainer.getDefaultProfiles(
-                    modulePackage.getName(), modulePackage.getStream())
-                profiles_str = self._profile_report_formatter(modulePackage, default_profiles,
-                                                             enabled_str)
-                line.getColumnCell(column_name).setData(modulePackage.getName())
-                line.getColumnCell(
-                    column_stream).setData(
-                    modulePackage.getStream() + default_str + enabled_str + disabled_str)
-                line.getColumnCell(column_profiles).setData(profiles_str)
-                summary_str = self._summary_report_formatter(modulePackage.getSummary())
-                line.getColumnCell(column_info).setData(summary_str)
+                rows.append((modulePackage, modulePackage.getName(), modulePackage.getStream()))
+
+        default_streams, installed_profiles, default_profiles_dict = self._get_report_data(rows)
+        for modulePackage, name, stream in rows:
+            line = table.newLine()
+            default_str, enabled_str, disabled_str = self._module_strs_formatter(
+                modulePackage, stream == default_streams[name], markActive=False)
+            profiles_str = self._profile_report_formatter(
+                modulePackage, default_profiles_dict[(name, stream)], installed_profiles[name],
+                enabled_str)
+            line.getColumnCell(column_name).setData(name)
+            line.getColumnCell(
+                column_stream).setData(stream + default_str + enabled_str + disabled_str)
+            line.getColumnCell(column_profiles).setData(profiles_str)
+            summary_str = self._summary_report_formatter(modulePackage.getSummary())
+            line.getColumnCell(column_info).setData(summary_str)
 
         return table
 
@@ -785,47 +875,46 @@ class ModuleBase(object):
             return ""
 
         table = self._create_and_fill_table(latest)
-        current_repo_id_index = 0
-        already_printed_lines = 0
-        try:
-            repo_name = self.base.repos[latest[0][0][0].getRepoID()].name
-        except KeyError:
-            repo_name = latest[0][0][0].getRepoID()
-        versions = len(latest[0])
         header = self._format_header(table)
-        str_table = self._format_repoid(repo_name)
-        str_table += header
-        for i in range(0, table.getNumberOfLines()):
-            if versions + already_printed_lines <= i:
-                already_printed_lines += versions
-                current_repo_id_index += 1
-                # Fail-Safe repository is not in self.base.repos
-                try:
-                    repo_name = self.base.repos[
-                        latest[current_repo_id_index][0][0].getRepoID()].name
-                except KeyError:
-                    repo_name = latest[current_repo_id_index][0][0].getRepoID()
-                versions = len(latest[current_repo_id_index])
-                str_table += "\n"
-                str_table += self._format_repoid(repo_name)
-                str_table += header
-
-            line = table.getLine(i)
-            str_table += table.toString(line, line)
-        return str_table + MODULE_TABLE_HINT
+        parts = []
+        # table lines follow the order of latest, one line per name:stream:arch
+        first_line = 0
+        for latest_per_repo in latest:
+            repo_id = latest_per_repo[0][0].getRepoID()
+            # Fail-Safe repository is not in self.base.repos
+            try:
+                repo_name = self.base.repos[repo_id].name
+            except KeyError:
+                repo_name = repo_id
+            if first_line:
+                parts.append("\n")
+            parts.append(self._format_repoid(repo_name))
+            parts.append(header)
+            last_line = first_line + len(latest_per_repo)
+            for i in range(first_line, last_line):
+                line = table.getLine(i)
+                parts.append(table.toString(line, line))
+            first_line = last_line
+        parts.append(MODULE_TABLE_HINT)
+        return "".join(parts)
 
     def _format_header(self, table):
         line = table.getLine(0)
         return table.toString(line, line).split('\n', 1)[0] + '\n'
 
     def _format_repoid(self, repo_name):
-        return "{}\n".format(self.base.output.term.bold(repo_name))
+        return f"{self.base.output.term.bold(repo_name)}\n"
 
     def _install_profiles_internal(self, install_set_artifacts, install_dict, strict):
         #  Remove source packages because they cannot be installed or upgraded
         base_no_source_query = self.base.sack.query().filterm(arch__neq=['src', 'nosrc']).apply()
-        install_base_query = base_no_source_query.filter(nevra_strict=install_set_artifacts)
+        if install_set_artifacts:
+            install_base_query = base_no_source_query.filter(nevra_strict=install_set_artifacts)
+        else:
+            install_base_query = base_no_source_query.filter(empty=True)
         error_specs = []
+        if not install_dict:
+            return install_base_query, error_specs
 
         # add hot-fix packages
         hot_fix_repos = [i.id for i in self.base.repos.iter_enabled() if i.module_hotfixes]
@@ -833,21 +922,32 @@ class ModuleBase(object):
             reponame=hot_fix_repos, name=install_dict.keys())
         install_base_query = install_base_query.union(hotfix_packages)
 
+        # <package_name, [packages]>
+        modular_pkgs = {}
+        for pkg in install_base_query.filter(name=install_dict.keys()):
+            modular_pkgs.setdefault(pkg.name, []).append(pkg)
+        # package can also be non-modular or part of another stream
+        other_pkgs = {}
+        missing_names = [name for name in install_dict if name not in modular_pkgs]
+        if missing_names:
+            for pkg in base_no_source_query.filter(name=missing_names):
+                other_pkgs.setdefault(pkg.name, []).append(pkg)
+
+        goal = self.base._goal
         for pkg_name, set_specs in install_dict.items():
-            query = install_base_query.filter(name=pkg_name)
+            query = modular_pkgs.get(pkg_name)
             if not query:
-                # package can also be non-modular or part of another stream
-                query = base_no_source_query.filter(name=pkg_name)
+                query = other_pkgs.get(pkg_name)
                 if not query:
                     for spec in set_specs:
                         logger.error(_("Unable to resolve argument {}").format(spec))
                     logger.error(_("No match for package {}").format(pkg_name))
                     error_specs.extend(set_specs)
                     continue
-            self.base._goal.group_members.add(pkg_name)
+            goal.group_members.add(pkg_name)
             sltr = dnf.selector.Selector(self.base.sack)
             sltr.set(pkg=query)
-            self.base._goal.install(select=sltr, optional=(not strict))
+            goal.install(select=sltr, optional=(not strict))
         return install_base_query, error_specs
 
 
@@ -174,7 +174,10 @@ def empty(iterable):
     try:
         l = len(iterable)
     except TypeError:
-        l = len(list(iterable))
+        # do not materialize the whole iterable, one item is enough to decide
+        for __ in iterable:
+            return False
+        return True
     return l == 0
 
 def first(iterable):
@@ -19,6 +19,7 @@ from __future__ import absolute_import
 from __future__ import unicode_literals
 
 import os
+import re
 import shutil
 import tempfile
 import unittest
@@ -28,6 +29,8 @@ import libdnf
 import dnf.conf
 import dnf.base
 
+from tests.support import mock
+
 TOP_DIR = os.path.abspath(os.path.dirname(__file__))
 REPOS_DIR = os.path.join(TOP_DIR, "modules/modules")
 
@@ -164,17 +167,149 @@ class ModuleTest(unittest.TestCase):
         with self.assertRaises(dnf.exceptions.Error):
             self.module_base.disable(["httpd:invalid"])
 
+    # ModuleBase.get_modules()
+
+    def test_get_modules_new_sack(self):
+        modules, nsvcap = self.module_base.get_modules("httpd")
+        self.assertTrue(modules)
+        self.assertEqual(nsvcap.name, "httpd")
+
+        # replace the sack by one without the httpd module
+        self.base.reset(sack=True, repos=True, goal=True)
+        self._add_module_repo("m4-1.4.18-1")
+        self.base.fill_sack(load_system_repo=False)
+
+        self.assertEqual(self.module_base.get_modules("httpd"), ((), None))
+        modules, nsvcap = self.module_base.get_modules("m4")
+        self.assertEqual([module.getName() for module in modules], ["m4"])
+
+    def test_get_modules_cache_cleared_by_enable_disable(self):
+        self.module_base.get_modules("httpd")
+        self.assertIn("httpd", self.module_base._modules_cache)
+        self.module_base.enable(["httpd:2.4"])
+        self.assertEqual(self.module_base._modules_cache, {})
+
+        self.module_base.get_modules("httpd")
+        self.assertIn("httpd", self.module_base._modules_cache)
+        self.module_base.disable(["httpd"])
+        self.assertEqual(self.module_base._modules_cache, {})
+
+    def test_get_modules_no_match_queried_again_after_filter_modules(self):
+        with mock.patch.object(self.module_base, "_query_modules",
+                               wraps=self.module_base._query_modules) as query_modules:
+            self.assertEqual(self.module_base.get_modules("invalid"), ((), None))
+            self.assertEqual(self.module_base.get_modules("invalid"), ((), None))
+            self.assertEqual(query_modules.call_count, 1)
+
+            # filter_modules() may add fail-safe modules, the miss must not be reused
+            self.module_base._update_sack()
+            self.assertEqual(self.module_base.get_modules("invalid"), ((), None))
+            self.assertEqual(query_modules.call_count, 2)
+
+    def test_get_modules_returns_tuple(self):
+        modules, __ = self.module_base.get_modules("httpd")
+        self.assertIsInstance(modules, tuple)
+        self.assertIs(self.module_base.get_modules("httpd")[0], modules)
+
+    def _get_info_tables(self, module_specs):
+        output = self.module_base._get_info(module_specs)
+        self.assertTrue(output.endswith(dnf.module.module_base.MODULE_INFO_TABLE_HINT))
+        return output[:-len(dnf.module.module_base.MODULE_INFO_TABLE_HINT)].split("\n\n")
+
     def test_info_name(self):
-        pass
+        self.module_base.enable(["httpd:2.4"])
+        tables = self._get_info_tables(["httpd"])
+        self.assertEqual(len(tables), 3)
+        # sorted by the rendered text, so 2.2 comes first
+        self.assertRegex(tables[0], r"Stream[ \t]*:[ \t]*2\.2[ \t]*\n")
+        self.assertRegex(tables[0], r"Profiles[ \t]*:[ \t]*default, doc[ \t]*\n")
+        for table, version in zip(tables[1:], ["1", "2"]):
+            self.assertRegex(table, r"Stream[ \t]*:[ \t]*2\.4 \[d\]\[e\]")
+            self.assertRegex(table, r"Version[ \t]*:[ \t]*%s[ \t]*\n" % version)
+            self.assertRegex(table, r"Profiles[ \t]*:[ \t]*default \[d\], doc[ \t]*\n")
+            self.assertRegex(table, r"Default profiles[ \t]*:[ \t]*default[ \t]*\n")
+            self.assertRegex(table, r"Repo[ \t]*:[ \t]*_all[ \t]*\n")
 
     def test_info_name_stream(self):
-        pass
+        tables = self._get_info_tables(["httpd:2.4"])
+        self.assertEqual(len(tables), 2)
+        self.assertRegex(tables[0], r"Version[ \t]*:[ \t]*1[ \t]*\n")
+        self.assertRegex(tables[1], r"Version[ \t]*:[ \t]*2[ \t]*\n")
 
     def test_info_pkgspec(self):
-        pass
+        # the profile is ignored
+        tables = self._get_info_tables(["httpd:2.4:1/foo"])
+        self.assertEqual(len(tables), 1)
+        self.assertRegex(tables[0], r"Stream[ \t]*:[ \t]*2\.4 \[d\]")
+        self.assertRegex(tables[0], r"Version[ \t]*:[ \t]*1[ \t]*\n")
+
+    def test_info_duplicate_specs(self):
+        # modules matched by several specs are reported once
+        tables = self._get_info_tables(["httpd:2.4", "httpd:2.4:1", "httpd:2.4:2"])
+        self.assertEqual(len(tables), 2)
+
+    def test_info_installed_profile(self):
+        self.test_enable_name_stream()
+        self.module_base.install(["httpd:2.4/default"])
+        for table in self._get_info_tables(["httpd:2.4"]):
+            self.assertRegex(table, r"Profiles[ \t]*:[ \t]*default \[d\] \[i\], doc[ \t]*\n")
+
+    def test_info_disabled(self):
+        self.module_base.disable(["httpd"])
+        tables = self._get_info_tables(["httpd"])
+        self.assertEqual(len(tables), 3)
+        self.assertRegex(tables[0], r"Stream[ \t]*:[ \t]*2\.2 \[x\]")
+        for table in tables[1:]:
+            self.assertRegex(table, r"Stream[ \t]*:[ \t]*2\.4 \[d\]\[x\]")
 
     # dnf module list
 
+    def _get_list_rows(self, module_specs=()):
+        """Return <repo_name, <(module_name, stream), row>> of `dnf module list` output."""
+        self.base.output = mock.Mock()
+        self.base.output.term.bold.side_effect = lambda s: "**%s**" % s
+        output = self.module_base._get_brief_description(
+            module_specs, libdnf.module.ModulePackageContainer.ModuleState_UNKNOWN)
+        self.assertTrue(output.endswith(dnf.module.module_base.MODULE_TABLE_HINT))
+        groups = {}
+        rows = None
+        for line in output[:-len(dnf.module.module_base.MODULE_TABLE_HINT)].splitlines():
+            if line.startswith("**") and line.endswith("**"):
+                self.assertNotIn(line[2:-2], groups)
+                rows = groups[line[2:-2]] = {}
+            elif line.strip() and not line.startswith("Name "):
+                fields = line.split()
+                rows[(fields[0], fields[1])] = line
+        return groups
+
+    def test_list_markers(self):
+        self.test_enable_name_stream()
+        self.module_base.install(["httpd:2.4/default"])
+        rows = self._get_list_rows()[self.base.repos["_all"].name]
+        self.assertEqual(rows[("httpd", "2.2")].split()[1:], ["2.2", "default,", "doc"])
+        self.assertEqual(rows[("httpd", "2.4")].split()[1:],
+                         ["2.4", "[d][e]", "default", "[d]", "[i],", "doc"])
+        self.assertEqual(rows[("base-runtime", "f26")].split()[1:],
+                         ["f26", "[d][e]", "default,", "minimal", "[d]"])
+
+    def test_list_disabled(self):
+        self.module_base.disable(["httpd"])
+        rows = self._get_list_rows(["httpd"])[self.base.repos["_all"].name]
+        self.assertEqual(sorted(rows), [("httpd", "2.2"), ("httpd", "2.4")])
+        self.assertEqual(rows[("httpd", "2.2")].split()[1:3], ["2.2", "[x]"])
+        self.assertEqual(rows[("httpd", "2.4")].split()[1:3], ["2.4", "[d][x]"])
+
+    def test_list_per_repo(self):
+        self.base.reset(sack=True, repos=True, goal=True)
+        self._add_module_repo("_all").name = "All modules"
+        self._add_module_repo("httpd-2.2-1").name = "httpd 2.2 only"
+        self.base.fill_sack(load_system_repo=False)
+
+        groups = self._get_list_rows(["httpd"])
+        self.assertEqual(sorted(groups), ["All modules", "httpd 2.2 only"])
+        self.assertEqual(sorted(groups["All modules"]), [("httpd", "2.2"), ("httpd", "2.4")])
+        self.assertEqual(sorted(groups["httpd 2.2 only"]), [("httpd", "2.2")])
+
     def test_list_installed(self):
         # install
         self.module_base.install(["base-runtime"])
@@ -309,6 +444,63 @@ class ModuleTest(unittest.TestCase):
     def test_remove_invalid(self):
         pass
 
+    # dnf module provides
+
+    def _mock_output(self):
+        self.base.output = mock.Mock()
+        self.base.output.term.bold.side_effect = lambda s: s
+
+    def test_what_provides_package_in_two_modules(self):
+        # libnghttp2-0:1.21.1-1.x86_64 is an artifact of httpd:2.4:1 and httpd:2.4:2
+        self._mock_output()
+        output = self.module_base._what_provides(["libnghttp2-1.21.1-1.x86_64"])
+        blocks = output.split("\n\n")
+        self.assertEqual(len(blocks), 2)
+        for block, version in zip(blocks, ["1", "2"]):
+            self.assertTrue(block.startswith("libnghttp2-1.21.1-1.x86_64\n"))
+            self.assertRegex(block, r"Module\s*:\s*httpd:2\.4:%s:" % version)
+            self.assertRegex(block, r"Repo\s*:\s*_all")
+            self.assertRegex(block, r"Profiles[ \t]*:[ \t]*\n")
+
+    def test_what_provides_profiles(self):
+        self._mock_output()
+        output = self.module_base._what_provides(["httpd-2.4.25-8.x86_64"])
+        blocks = output.split("\n\n")
+        self.assertEqual(len(blocks), 1)
+        self.assertTrue(blocks[0].startswith("httpd-2.4.25-8.x86_64\n"))
+        self.assertRegex(blocks[0], r"Module\s*:\s*httpd:2\.4:2:")
+        self.assertRegex(blocks[0], r"Profiles\s*:\s*default\s")
+
+    def test_what_provides_no_match(self):
+        self._mock_output()
+        self.assertEqual(self.module_base._what_provides(["nonexistent"]), "")
+
+    def test_what_provides_artifact_without_epoch(self):
+        # fixture artifacts always carry an epoch, add a module listing one without it
+        self._mock_output()
+        epochless_module = mock.Mock()
+        epochless_module.getId.return_value = "epochless"
+        epochless_module.getFullIdentifier.return_value = "epochless:1:1:c:x86_64"
+        epochless_module.getArtifacts.return_value = ["httpd-2.4.25-8.x86_64"]
+        epochless_module.getProfiles.return_value = []
+        epochless_module.getRepoID.return_value = "_all"
+        epochless_module.getSummary.return_value = ""
+        modules = list(self.base._moduleContainer.getModulePackages())
+
+        for module_list, expected in [
+                ([epochless_module], ["epochless:1:1:c:x86_64"]),
+                (modules + [epochless_module], ["epochless:1:1:c:x86_64", "httpd:2.4:2:"])]:
+            container = mock.Mock()
+            container.getModulePackages.return_value = module_list
+            with mock.patch.object(dnf.base.Base, "_moduleContainer",
+                                   new_callable=mock.PropertyMock, return_value=container):
+                output = self.module_base._what_provides(["httpd-2.4.25-8.x86_64"])
+            blocks = output.split("\n\n")
+            self.assertEqual(len(blocks), len(expected))
+            for block, module_id in zip(blocks, expected):
+                self.assertTrue(block.startswith("httpd-2.4.25-8.x86_64\n"))
+                self.assertRegex(block, r"Module\s*:\s*%s" % re.escape(module_id))
+
     def test_bare_rpms_filtering(self):
         """
         Test hybrid repos where RPMs of the same name (or Provides)